@@ -0,0 +1,65 @@
+# Generated by Django 5.2.5 on 2026-10-19 20:31
+
+import django.core.validators
+import django.db.models.deletion
+from decimal import Decimal
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    initial = True
+
+    dependencies = [
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='CRMReport',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('period_start', models.DateTimeField()),
+                ('period_end', models.DateTimeField()),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('total_customers', models.PositiveIntegerField(default=0)),
+                ('new_customers', models.PositiveIntegerField(default=0)),
+                ('total_orders', models.PositiveIntegerField(default=0)),
+                ('total_revenue', models.DecimalField(decimal_places=2, default=Decimal('0.00'), max_digits=14)),
+                ('average_order_value', models.DecimalField(decimal_places=2, default=Decimal('0.00'), max_digits=14)),
+                ('daily_revenue', models.JSONField(default=list)),
+                ('product_mix', models.JSONField(default=list)),
+            ],
+            options={
+                'ordering': ['-created_at'],
+            },
+        ),
+        migrations.CreateModel(
+            name='Customer',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('name', models.CharField(max_length=255)),
+                ('email', models.EmailField(max_length=254, unique=True)),
+                ('phone', models.CharField(blank=True, max_length=30, null=True, validators=[django.core.validators.RegexValidator(message='Phone must be in format +1234567890 or 123-456-7890', regex='^(\\+?\\d{7,15}|[0-9\\-\\s]{7,20})$')])),
+                ('created_at', models.DateTimeField(auto_now_add=True, db_index=True)),
+            ],
+        ),
+        migrations.CreateModel(
+            name='Product',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('name', models.CharField(max_length=255)),
+                ('price', models.DecimalField(decimal_places=2, max_digits=12, validators=[django.core.validators.MinValueValidator(Decimal('0.01'))])),
+                ('stock', models.PositiveIntegerField(default=0)),
+            ],
+        ),
+        migrations.CreateModel(
+            name='Order',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('order_date', models.DateTimeField(auto_now_add=True, db_index=True)),
+                ('total_amount', models.DecimalField(decimal_places=2, default=Decimal('0.00'), max_digits=14)),
+                ('customer', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='orders', to='crm.customer')),
+                ('products', models.ManyToManyField(related_name='orders', to='crm.product')),
+            ],
+        ),
+    ]
@@ -11,7 +11,7 @@ class Customer(models.Model):
     name = models.CharField(max_length=255)
     email = models.EmailField(unique=True)
     phone = models.CharField(max_length=30, blank=True, null=True, validators=[phone_validator])
-    created_at = models.DateTimeField(auto_now_add=True)
+    created_at = models.DateTimeField(auto_now_add=True, db_index=True)
 
     def __str__(self):
         return f"{self.name} <{self.email}>"
@@ -27,7 +27,7 @@ class Product(models.Model):
 class Order(models.Model):
     customer = models.ForeignKey(Customer, related_name='orders', on_delete=models.CASCADE)
     products = models.ManyToManyField(Product, related_name='orders')
-    order_date = models.DateTimeField(auto_now_add=True)
+    order_date = models.DateTimeField(auto_now_add=True, db_index=True)
     total_amount = models.DecimalField(max_digits=14, decimal_places=2, default=Decimal('0.00'))
 
     def calculate_total(self):
@@ -37,3 +37,23 @@ class Order(models.Model):
 
     def save(self, *args, **kwargs):
         super().save(*args, **kwargs)
+
+class CRMReport(models.Model):
+    period_start = models.DateTimeField()
+    period_end = models.DateTimeField()
+    created_at = models.DateTimeField(auto_now_add=True)
+    total_customers = models.PositiveIntegerField(default=0)
+    new_customers = models.PositiveIntegerField(default=0)
+    total_orders = models.PositiveIntegerField(default=0)
+    total_revenue = models.DecimalField(max_digits=14, decimal_places=2, default=Decimal('0.00'))
+    average_order_value = models.DecimalField(max_digits=14, decimal_places=2, default=Decimal('0.00'))
+    # [{"day": "2025-01-06", "orders": 3, "revenue": "120.00"}, ...]
+    daily_revenue = models.JSONField(default=list)
+    # [{"product_id": 1, "name": "Laptop", "order_lines": 2, "revenue": "1999.98"}, ...]
+    product_mix = models.JSONField(default=list)
+
+    class Meta:
+        ordering = ['-created_at']
+
+    def __str__(self):
+        return f"CRM report {self.period_start:%Y-%m-%d} - {self.period_end:%Y-%m-%d}"
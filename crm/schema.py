@@ -1,11 +1,60 @@
 import graphene
-from crm.models import Customer, Order, Product
+from datetime import date
+from django.db.models import Sum
+from crm.models import Customer, Order, Product, CRMReport
 from crm.models import Product
 
+
+class DailyRevenueType(graphene.ObjectType):
+    day = graphene.Date()
+    orders = graphene.Int()
+    revenue = graphene.Float()
+
+
+class ProductMixType(graphene.ObjectType):
+    product_id = graphene.ID()
+    name = graphene.String()
+    # Orders containing the product, not units sold
+    order_lines = graphene.Int()
+    # Priced at the product's current price, not the price at order time
+    revenue = graphene.Float()
+
+
+class CRMReportType(graphene.ObjectType):
+    id = graphene.ID()
+    period_start = graphene.DateTime()
+    period_end = graphene.DateTime()
+    created_at = graphene.DateTime()
+    total_customers = graphene.Int()
+    new_customers = graphene.Int()
+    total_orders = graphene.Int()
+    total_revenue = graphene.Float()
+    average_order_value = graphene.Float()
+    daily_revenue = graphene.List(DailyRevenueType)
+    product_mix = graphene.List(ProductMixType)
+
+    def resolve_daily_revenue(report, info):
+        return [
+            DailyRevenueType(day=date.fromisoformat(row["day"]), orders=row["orders"], revenue=row["revenue"])
+            for row in report.daily_revenue
+        ]
+
+    def resolve_product_mix(report, info):
+        return [ProductMixType(**row) for row in report.product_mix]
+
+
 class Query(graphene.ObjectType):
     total_customers = graphene.Int()
     total_orders = graphene.Int()
     total_revenue = graphene.Float()
+    crm_report = graphene.Field(CRMReportType, id=graphene.ID(required=True))
+
+    def resolve_crm_report(root, info, id):
+        try:
+            report_id = int(id)
+        except (TypeError, ValueError):
+            return None
+        return CRMReport.objects.filter(pk=report_id).first()
 
     def resolve_total_customers(root, info):
         return Customer.objects.count()
@@ -14,7 +63,7 @@ class Query(graphene.ObjectType):
         return Order.objects.count()
 
     def resolve_total_revenue(root, info):
-        return sum(order.total_amount for order in Order.objects.all())
+        return Order.objects.aggregate(total=Sum("total_amount"))["total"] or 0
 
 
 class UpdateLowStockProducts(graphene.Mutation):
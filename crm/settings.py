@@ -1,6 +1,15 @@
 from celery.schedules import crontab
 
+# The report tasks query the ORM, so the worker shares the web app's
+# database, timezone and primary key settings
+from alx_backend_graphql.settings import BASE_DIR, DATABASES, TIME_ZONE, USE_TZ, DEFAULT_AUTO_FIELD
+
 CELERY_BROKER_URL = "redis://localhost:6379/0"
+# Chords (used by the partitioned CRM report) need a result backend
+CELERY_RESULT_BACKEND = "redis://localhost:6379/0"
+
+# Date-range partitions the weekly CRM report is split into
+CRM_REPORT_PARTITIONS = 7
 
 INSTALLED_APPS = [
     'django.contrib.admin',
@@ -12,8 +21,6 @@ INSTALLED_APPS = [
     'graphene_django',
     'django_filters',
     'crm',
-    'graphene_django',
-    'django_filters',
     'django_crontab',
     'django_celery_beat',
 ]
@@ -1,57 +1,183 @@
-import os
 import logging
-from datetime import datetime
-from gql import gql, Client
-from gql.transport.requests import RequestsHTTPTransport
-from celery import shared_task
+from datetime import datetime, timedelta
+from decimal import Decimal
+from celery import chord, shared_task
+from django.conf import settings
+from django.db.models import Count, Sum
+from django.db.models.functions import TruncDate
+from django.utils import timezone
+
+from crm.models import Customer, Order, CRMReport
 
 # Configure logging to the temp log file
 LOG_FILE = "/tmp/crm_report_log.txt"
 logging.basicConfig(filename=LOG_FILE, level=logging.INFO)
 
-# GraphQL endpoint (make sure your app runs on localhost:8000)
-GRAPHQL_ENDPOINT = "http://localhost:8000/graphql"
+# Number of days covered by the weekly report
+REPORT_DAYS = 7
+
+
+def report_partitions(period_start, period_end, partitions):
+    """
+    Split [period_start, period_end) into at most `partitions` contiguous
+    ranges aligned on day boundaries. Returns a list of (start, end) tuples.
+    """
+    days = max((period_end - period_start).days, 1)
+    partitions = max(1, min(partitions, days))
+    size, extra = divmod(days, partitions)
+
+    ranges = []
+    start = period_start
+    for i in range(partitions):
+        end = start + timedelta(days=size + (1 if i < extra else 0))
+        ranges.append((start, min(end, period_end)))
+        start = end
+    return ranges
 
 
 @shared_task
-def generate_crm_report():
+def compute_crm_report_partition(start, end):
     """
-    Celery task that generates a weekly CRM report:
-    - Total customers
-    - Total orders
-    - Total revenue
-    Logs the result to /tmp/crm_report_log.txt
+    Aggregate orders and customers created in [start, end) in SQL.
+    Dates are ISO strings and money is returned as strings so the result
+    stays JSON-serializable between workers.
+
+    Product mix counts order lines (orders containing the product), not
+    units, and its revenue uses each product's current price, since orders
+    do not record prices. It will not add up to total_revenue (which comes
+    from Order.total_amount) and changes if a price is edited later.
     """
+    start = datetime.fromisoformat(start)
+    end = datetime.fromisoformat(end)
+    orders = Order.objects.filter(order_date__gte=start, order_date__lt=end)
 
-    # Configure GraphQL client
-    transport = RequestsHTTPTransport(
-        url=GRAPHQL_ENDPOINT,
-        verify=False,
-        retries=3,
+    totals = orders.aggregate(total_orders=Count("id"), total_revenue=Sum("total_amount"))
+
+    daily = (
+        orders.annotate(day=TruncDate("order_date"))
+        .values("day")
+        .annotate(orders=Count("id"), revenue=Sum("total_amount"))
+        .order_by("day")
     )
-    client = Client(transport=transport, fetch_schema_from_transport=False)
-
-    # GraphQL query for summary data
-    query = gql("""
-    query {
-        totalCustomers
-        totalOrders
-        totalRevenue
+
+    mix = (
+        Order.products.through.objects
+        .filter(order__order_date__gte=start, order__order_date__lt=end)
+        .values("product_id", "product__name")
+        .annotate(order_lines=Count("id"), revenue=Sum("product__price"))
+    )
+
+    return {
+        "new_customers": Customer.objects.filter(created_at__gte=start, created_at__lt=end).count(),
+        "total_orders": totals["total_orders"],
+        "total_revenue": str(totals["total_revenue"] or Decimal("0.00")),
+        "daily_revenue": [
+            {"day": row["day"].isoformat(), "orders": row["orders"], "revenue": str(row["revenue"])}
+            for row in daily
+        ],
+        "product_mix": [
+            {
+                "product_id": row["product_id"],
+                "name": row["product__name"],
+                "order_lines": row["order_lines"],
+                "revenue": str(row["revenue"]),
+            }
+            for row in mix
+        ],
     }
-    """)
 
-    try:
-        result = client.execute(query)
-        total_customers = result["totalCustomers"]
-        total_orders = result["totalOrders"]
-        total_revenue = result["totalRevenue"]
 
-        timestamp = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
-        report = f"{timestamp} - Report: {total_customers} customers, {total_orders} orders, {total_revenue} revenue"
+@shared_task
+def merge_crm_report_partitions(partials, period_start, period_end):
+    """
+    Chord callback: merge partition results into a CRMReport snapshot
+    and log a summary line to /tmp/crm_report_log.txt.
+    """
+    new_customers = 0
+    total_orders = 0
+    total_revenue = Decimal("0.00")
+    daily_revenue = {}
+    product_mix = {}
+
+    for partial in partials:
+        new_customers += partial["new_customers"]
+        total_orders += partial["total_orders"]
+        total_revenue += Decimal(partial["total_revenue"])
+
+        for row in partial["daily_revenue"]:
+            day = daily_revenue.setdefault(row["day"], {"day": row["day"], "orders": 0, "revenue": Decimal("0.00")})
+            day["orders"] += row["orders"]
+            day["revenue"] += Decimal(row["revenue"])
 
-        logging.info(report)
-        print("CRM weekly report generated successfully!")
+        for row in partial["product_mix"]:
+            product = product_mix.setdefault(
+                row["product_id"],
+                {"product_id": row["product_id"], "name": row["name"], "order_lines": 0, "revenue": Decimal("0.00")},
+            )
+            product["order_lines"] += row["order_lines"]
+            product["revenue"] += Decimal(row["revenue"])
+
+    average_order_value = (total_revenue / total_orders).quantize(Decimal("0.01")) if total_orders else Decimal("0.00")
+
+    report = CRMReport.objects.create(
+        period_start=datetime.fromisoformat(period_start),
+        period_end=datetime.fromisoformat(period_end),
+        total_customers=Customer.objects.filter(created_at__lt=datetime.fromisoformat(period_end)).count(),
+        new_customers=new_customers,
+        total_orders=total_orders,
+        total_revenue=total_revenue,
+        average_order_value=average_order_value,
+        daily_revenue=[
+            {**row, "revenue": str(row["revenue"])}
+            for _, row in sorted(daily_revenue.items())
+        ],
+        product_mix=[
+            {**row, "revenue": str(row["revenue"])}
+            for row in sorted(product_mix.values(), key=lambda r: r["revenue"], reverse=True)
+        ],
+    )
+
+    timestamp = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+    logging.info(
+        f"{timestamp} - Report #{report.id}: {report.total_customers} customers "
+        f"({new_customers} new), {total_orders} orders, {total_revenue} revenue, "
+        f"{average_order_value} average order value"
+    )
+    return report.id
+
+
+@shared_task
+def log_crm_report_failure(request, exc, traceback):
+    """Chord error callback: log a failed partition or merge to /tmp/crm_report_log.txt."""
+    logging.error(f"Error generating CRM report (task {request.id}): {exc}")
+
+
+@shared_task
+def generate_crm_report(days=REPORT_DAYS, partitions=None):
+    """
+    Celery task that generates a weekly CRM report snapshot:
+    - Total and new customers
+    - Total orders, revenue and average order value
+    - Revenue per day and product mix
+    The period is split into date-range partitions aggregated in parallel;
+    merge_crm_report_partitions saves the result as a CRMReport.
+    Returns the chord's AsyncResult id.
+    """
+    if partitions is None:
+        partitions = getattr(settings, "CRM_REPORT_PARTITIONS", days)
+
+    period_end = timezone.localtime().replace(hour=0, minute=0, second=0, microsecond=0)
+    period_start = period_end - timedelta(days=days)
+
+    try:
+        header = [
+            compute_crm_report_partition.s(start.isoformat(), end.isoformat())
+            for start, end in report_partitions(period_start, period_end, partitions)
+        ]
+        callback = merge_crm_report_partitions.s(period_start.isoformat(), period_end.isoformat())
+        result = chord(header)(callback.on_error(log_crm_report_failure.s()))
+        logging.info(f"CRM weekly report scheduled ({len(header)} partitions, chord {result.id})")
+        return result.id
 
     except Exception as e:
         logging.error(f"Error generating CRM report: {e}")
-        print(f"Error: {e}")
@@ -1,3 +1,246 @@
+from datetime import datetime, timedelta, timezone as dt_timezone
+from decimal import Decimal
+from unittest import mock
 from django.test import TestCase
 
-# Create your tests here.
+from crm.models import Customer, Order, Product, CRMReport
+from crm.schema import schema
+from crm.tasks import (
+    report_partitions,
+    compute_crm_report_partition,
+    merge_crm_report_partitions,
+    generate_crm_report,
+)
+
+PERIOD_START = datetime(2025, 1, 6, tzinfo=dt_timezone.utc)
+PERIOD_END = PERIOD_START + timedelta(days=7)
+
+
+def make_partial(new_customers=0, total_orders=0, total_revenue="0.00", daily_revenue=None, product_mix=None):
+    return {
+        "new_customers": new_customers,
+        "total_orders": total_orders,
+        "total_revenue": total_revenue,
+        "daily_revenue": daily_revenue or [],
+        "product_mix": product_mix or [],
+    }
+
+
+class ReportPartitionsTests(TestCase):
+    def test_partitions_are_contiguous_and_day_aligned(self):
+        ranges = report_partitions(PERIOD_START, PERIOD_END, 7)
+
+        self.assertEqual(len(ranges), 7)
+        self.assertEqual(ranges[0][0], PERIOD_START)
+        self.assertEqual(ranges[-1][1], PERIOD_END)
+        for (start, end), (next_start, _) in zip(ranges, ranges[1:]):
+            self.assertEqual(end, next_start)
+        for start, end in ranges:
+            self.assertEqual(end - start, timedelta(days=1))
+            self.assertEqual(start.time(), PERIOD_START.time())
+
+    def test_more_partitions_than_days(self):
+        ranges = report_partitions(PERIOD_START, PERIOD_END, 20)
+
+        self.assertEqual(len(ranges), 7)
+
+    def test_uneven_split(self):
+        ranges = report_partitions(PERIOD_START, PERIOD_END, 3)
+
+        self.assertEqual([(end - start).days for start, end in ranges], [3, 2, 2])
+        self.assertEqual(ranges[-1][1], PERIOD_END)
+
+    def test_zero_day_period(self):
+        ranges = report_partitions(PERIOD_START, PERIOD_START, 7)
+
+        self.assertEqual(ranges, [(PERIOD_START, PERIOD_START)])
+
+
+class MergeCRMReportPartitionsTests(TestCase):
+    def test_merges_days_and_products_across_partials(self):
+        partials = [
+            make_partial(
+                new_customers=1,
+                total_orders=2,
+                total_revenue="30.00",
+                daily_revenue=[{"day": "2025-01-06", "orders": 2, "revenue": "30.00"}],
+                product_mix=[{"product_id": 1, "name": "Pen", "order_lines": 2, "revenue": "20.00"}],
+            ),
+            make_partial(
+                new_customers=2,
+                total_orders=1,
+                total_revenue="15.00",
+                daily_revenue=[{"day": "2025-01-06", "orders": 1, "revenue": "15.00"}],
+                product_mix=[
+                    {"product_id": 1, "name": "Pen", "order_lines": 1, "revenue": "10.00"},
+                    {"product_id": 2, "name": "Book", "order_lines": 1, "revenue": "40.00"},
+                ],
+            ),
+        ]
+
+        report_id = merge_crm_report_partitions(partials, PERIOD_START.isoformat(), PERIOD_END.isoformat())
+        report = CRMReport.objects.get(pk=report_id)
+
+        self.assertEqual(report.new_customers, 3)
+        self.assertEqual(report.total_orders, 3)
+        self.assertEqual(report.total_revenue, Decimal("45.00"))
+        self.assertEqual(report.average_order_value, Decimal("15.00"))
+        self.assertEqual(report.period_start, PERIOD_START)
+        self.assertEqual(report.daily_revenue, [{"day": "2025-01-06", "orders": 3, "revenue": "45.00"}])
+        self.assertEqual(
+            report.product_mix,
+            [
+                {"product_id": 2, "name": "Book", "order_lines": 1, "revenue": "40.00"},
+                {"product_id": 1, "name": "Pen", "order_lines": 3, "revenue": "30.00"},
+            ],
+        )
+
+    def test_zero_orders(self):
+        report_id = merge_crm_report_partitions(
+            [make_partial(), make_partial()], PERIOD_START.isoformat(), PERIOD_END.isoformat()
+        )
+        report = CRMReport.objects.get(pk=report_id)
+
+        self.assertEqual(report.total_orders, 0)
+        self.assertEqual(report.average_order_value, Decimal("0.00"))
+        self.assertEqual(report.daily_revenue, [])
+        self.assertEqual(CRMReport.objects.count(), 1)
+
+    def test_total_customers_bounded_by_period_end(self):
+        Customer.objects.create(name="Alice", email="alice@example.com")
+        late = Customer.objects.create(name="Bob", email="bob@example.com")
+        Customer.objects.exclude(pk=late.pk).update(created_at=PERIOD_END - timedelta(days=1))
+        Customer.objects.filter(pk=late.pk).update(created_at=PERIOD_END + timedelta(hours=6))
+
+        report_id = merge_crm_report_partitions([make_partial()], PERIOD_START.isoformat(), PERIOD_END.isoformat())
+
+        self.assertEqual(CRMReport.objects.get(pk=report_id).total_customers, 1)
+
+
+class GenerateCRMReportTests(TestCase):
+    @mock.patch("crm.tasks.chord")
+    def test_dispatches_partitions_as_chord(self, mock_chord):
+        mock_chord.return_value.return_value.id = "chord-id"
+        now = datetime(2025, 1, 13, 6, 0, tzinfo=dt_timezone.utc)
+
+        with mock.patch("crm.tasks.timezone.localtime", return_value=now):
+            result = generate_crm_report()
+
+        self.assertEqual(result, "chord-id")
+
+        header = mock_chord.call_args.args[0]
+        self.assertEqual(len(header), 7)
+        self.assertTrue(all(sig.task == "crm.tasks.compute_crm_report_partition" for sig in header))
+        self.assertEqual(header[0].args[0], PERIOD_START.isoformat())
+        self.assertEqual(header[-1].args[1], PERIOD_END.isoformat())
+        for sig, next_sig in zip(header, header[1:]):
+            self.assertEqual(sig.args[1], next_sig.args[0])
+
+        callback = mock_chord.return_value.call_args.args[0]
+        self.assertEqual(callback.task, "crm.tasks.merge_crm_report_partitions")
+        self.assertEqual(callback.args, (PERIOD_START.isoformat(), PERIOD_END.isoformat()))
+        self.assertEqual(
+            [errback.task for errback in callback.options["link_error"]],
+            ["crm.tasks.log_crm_report_failure"],
+        )
+
+
+class ComputeCRMReportPartitionTests(TestCase):
+    def setUp(self):
+        self.pen = Product.objects.create(name="Pen", price=Decimal("2.50"), stock=100)
+        self.book = Product.objects.create(name="Book", price=Decimal("20.00"), stock=10)
+
+        self.alice = self.create_customer("Alice", "alice@example.com", PERIOD_START + timedelta(hours=1))
+        self.create_customer("Bob", "bob@example.com", PERIOD_START - timedelta(days=1))
+
+        self.create_order([self.pen, self.book], "22.50", PERIOD_START + timedelta(hours=2))
+        self.create_order([self.pen], "2.50", PERIOD_START + timedelta(hours=5))
+        self.create_order([self.book], "20.00", PERIOD_START + timedelta(days=1, hours=3))
+        self.create_order([self.book], "20.00", PERIOD_START - timedelta(hours=1))
+
+    def create_customer(self, name, email, created_at):
+        customer = Customer.objects.create(name=name, email=email)
+        # created_at is auto_now_add, so backdate it with an update
+        Customer.objects.filter(pk=customer.pk).update(created_at=created_at)
+        return customer
+
+    def create_order(self, products, total_amount, order_date):
+        order = Order.objects.create(customer=self.alice, total_amount=Decimal(total_amount))
+        order.products.set(products)
+        Order.objects.filter(pk=order.pk).update(order_date=order_date)
+        return order
+
+    def test_aggregates_only_its_date_range(self):
+        result = compute_crm_report_partition(
+            PERIOD_START.isoformat(), (PERIOD_START + timedelta(days=2)).isoformat()
+        )
+
+        self.assertEqual(result["new_customers"], 1)
+        self.assertEqual(result["total_orders"], 3)
+        self.assertEqual(Decimal(result["total_revenue"]), Decimal("45.00"))
+        self.assertEqual(
+            [(row["day"], row["orders"], Decimal(row["revenue"])) for row in result["daily_revenue"]],
+            [("2025-01-06", 2, Decimal("25.00")), ("2025-01-07", 1, Decimal("20.00"))],
+        )
+        mix = {row["name"]: (row["order_lines"], Decimal(row["revenue"])) for row in result["product_mix"]}
+        self.assertEqual(mix, {"Pen": (2, Decimal("5.00")), "Book": (2, Decimal("40.00"))})
+
+    def test_empty_range(self):
+        result = compute_crm_report_partition(
+            (PERIOD_START + timedelta(days=3)).isoformat(), (PERIOD_START + timedelta(days=4)).isoformat()
+        )
+
+        self.assertEqual(result["total_orders"], 0)
+        self.assertEqual(result["total_revenue"], "0.00")
+        self.assertEqual(result["daily_revenue"], [])
+        self.assertEqual(result["product_mix"], [])
+
+
+class CRMReportQueryTests(TestCase):
+    query = """
+    query ($id: ID!) {
+        crmReport(id: $id) {
+            id
+            totalOrders
+            totalRevenue
+            averageOrderValue
+            dailyRevenue { day orders revenue }
+            productMix { productId name orderLines revenue }
+        }
+    }
+    """
+
+    def test_resolves_saved_report(self):
+        report = CRMReport.objects.create(
+            period_start=PERIOD_START,
+            period_end=PERIOD_END,
+            total_orders=2,
+            total_revenue=Decimal("30.00"),
+            average_order_value=Decimal("15.00"),
+            daily_revenue=[{"day": "2025-01-06", "orders": 2, "revenue": "30.00"}],
+            product_mix=[{"product_id": 1, "name": "Pen", "order_lines": 2, "revenue": "5.00"}],
+        )
+
+        result = schema.execute(self.query, variables={"id": str(report.id)})
+
+        self.assertIsNone(result.errors)
+        data = result.data["crmReport"]
+        self.assertEqual(data["id"], str(report.id))
+        self.assertEqual(data["totalOrders"], 2)
+        self.assertEqual(data["averageOrderValue"], 15.0)
+        self.assertEqual(data["dailyRevenue"], [{"day": "2025-01-06", "orders": 2, "revenue": 30.0}])
+        self.assertEqual(
+            data["productMix"], [{"productId": "1", "name": "Pen", "orderLines": 2, "revenue": 5.0}]
+        )
+
+    def test_missing_report_is_null(self):
+        result = schema.execute(self.query, variables={"id": "999"})
+
+        self.assertIsNone(result.errors)
+        self.assertIsNone(result.data["crmReport"])
+
+    def test_non_numeric_id_is_null(self):
+        result = schema.execute(self.query, variables={"id": "abc"})
+
+        self.assertIsNone(result.errors)
+        self.assertIsNone(result.data["crmReport"])